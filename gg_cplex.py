@@ -1,10 +1,16 @@
 from docplex.mp.model import Model
 from tsp import TSP
+from model_cache import load_or_build_cplex
 import networkx as nx
 import numpy as np
 
-def make_gg_cplex_model(problem: TSP):
-    mdl = Model(name = f"gg_cplex_{problem.name}")
+def make_gg_cplex_model(problem: TSP, tight: bool = False, two_cycle: bool = False,
+                        context=None):
+    """
+    Modelo GG en docplex. tight y two_cycle seleccionan la variante reforzada,
+    igual que en make_gg_gurobi_model. context permite reutilizar un contexto de docplex.
+    """
+    mdl = Model(name = f"gg_cplex_{problem.name}", context=context)
     
     # --------------- Parametros ---------------
     G = problem.G                               # Grafo del problema
@@ -54,10 +60,27 @@ def make_gg_cplex_model(problem: TSP):
     # 4. Capacidad 
     # (Restricción 2f)
     for i, j in G.edges():
-        mdl.add_constraint(
-            y[i, j] <= (n - 1) * x[i, j],
-            ctname=f"cap_{i}_{j}"
-        )
+        if not tight:
+            mdl.add_constraint(
+                y[i, j] <= (n - 1) * x[i, j],
+                ctname=f"cap_{i}_{j}"
+            )
+            continue
+
+        if j == 0:
+            # Ningún flujo vuelve a la raíz
+            mdl.add_constraint(y[i, j] == 0, ctname=f"cap_{i}_{j}")
+            continue
+
+        cap = n - 1 if i == 0 else n - 2
+        mdl.add_constraint(y[i, j] <= cap * x[i, j], ctname=f"cap_{i}_{j}")
+        mdl.add_constraint(y[i, j] >= x[i, j], ctname=f"cap_lb_{i}_{j}")
+
+    # 5. Eliminación de 2-ciclos
+    if two_cycle:
+        for i, j in G.edges():
+            if i < j and G.has_edge(j, i):
+                mdl.add_constraint(x[i, j] + x[j, i] <= 1, ctname=f"two_cycle_{i}_{j}")
 
     # -------------- Función Objetivo --------------
     mdl.minimize(
@@ -66,8 +89,14 @@ def make_gg_cplex_model(problem: TSP):
 
     return mdl, x
 
-def gg_cplex_solve(problem: TSP, time_limit: int) -> tuple[dict, np.ndarray]:
-    mdl, x = make_gg_cplex_model(problem)
+def gg_cplex_solve(problem: TSP, time_limit: int, tight: bool = False,
+                   two_cycle: bool = False, cache_dir=None,
+                   context=None) -> tuple[dict, np.ndarray]:
+    if cache_dir is None:
+        mdl, x = make_gg_cplex_model(problem, tight=tight, two_cycle=two_cycle, context=context)
+    else:
+        mdl, x = load_or_build_cplex(problem, "gg", make_gg_cplex_model,
+                                    cache_dir, context=context, tight=tight, two_cycle=two_cycle)
     print(f"Resolviendo {problem.name}")
 
     mdl.set_time_limit(time_limit)
@@ -79,7 +108,7 @@ def gg_cplex_solve(problem: TSP, time_limit: int) -> tuple[dict, np.ndarray]:
     # Datos para el CSV
     instance = problem.name
     num_nodes = problem.n
-    model = "gg"
+    model = "gg" + ("_tight" if tight else "") + ("_2c" if two_cycle else "")
     solver = "cplex"
     num_vars = mdl.number_of_variables
     num_constrs = mdl.number_of_constraints
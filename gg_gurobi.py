@@ -1,15 +1,22 @@
 from tsp import TSP
+from model_cache import load_or_build_gurobi
 from gurobipy import *
 import networkx as nx
 import numpy as np
 
-def make_gg_gurobi_model(problem: TSP) -> tuple:
+def make_gg_gurobi_model(problem: TSP, tight: bool = False, two_cycle: bool = False,
+                         env=None) -> tuple:
     """
     Construye y retorna un modelo de Gurobi a partir del problema ATSP, con formulación GG
     Adicionalmente retorna la variable de decisión
+
+    Con tight=True se ajustan las capacidades: (n - 2) en arcos que no salen de la raíz,
+    0 en arcos que entran a la raíz, y todo arco usado lleva al menos una unidad.
+    Con two_cycle=True se agregan las desigualdades x_ij + x_ji <= 1.
+    El modelo se crea en env (o en el entorno por defecto si es None).
     """
 
-    mdl = Model(f"gg_{problem.name}") # Fixed string formatting
+    mdl = Model(f"gg_{problem.name}", env=env) # Fixed string formatting
 
     G = problem.G 
     n = problem.n 
@@ -45,22 +52,48 @@ def make_gg_gurobi_model(problem: TSP) -> tuple:
 
     # 4. Capacidad 
     for i, j in G.edges():
-        mdl.addConstr(y[i, j] <= (n - 1) * x[i, j], name=f"cap_{i}_{j}")
+        if not tight:
+            mdl.addConstr(y[i, j] <= (n - 1) * x[i, j], name=f"cap_{i}_{j}")
+            continue
+
+        if j == 0:
+            # Ningún flujo vuelve a la raíz
+            mdl.addConstr(y[i, j] == 0, name=f"cap_{i}_{j}")
+            continue
+
+        cap = n - 1 if i == 0 else n - 2
+        mdl.addConstr(y[i, j] <= cap * x[i, j], name=f"cap_{i}_{j}")
+        mdl.addConstr(y[i, j] >= x[i, j], name=f"cap_lb_{i}_{j}")
+
+    # 5. Eliminación de 2-ciclos
+    if two_cycle:
+        for i, j in G.edges():
+            if i < j and G.has_edge(j, i):
+                mdl.addConstr(x[i, j] + x[j, i] <= 1, name=f"two_cycle_{i}_{j}")
     
     # --- FO ---
     mdl.setObjective(quicksum(c[i, j] * x[i, j] for i, j in G.edges()), GRB.MINIMIZE)
     
     return mdl, x
 
-def gg_gurobi_solve(problem: TSP, time_limit: int) -> tuple[dict, np.ndarray]:
+def gg_gurobi_solve(problem: TSP, time_limit: int, tight: bool = False,
+                    two_cycle: bool = False, cache_dir=None,
+                    env=None) -> tuple[dict, np.ndarray]:
     """
     Resuelve un problema de ATSP con la formulacion GG, utilizando gurobi.
+    tight y two_cycle seleccionan la variante reforzada (ver make_gg_gurobi_model).
+    Si se entrega cache_dir, el modelo se lee/guarda en la caché en disco (ver model_cache).
+    env permite reutilizar un entorno de Gurobi ya iniciado (ver session).
     Retorna una tupla:
         1. Un diccionario con los datos de la solución, tiempo de ejecución, metadata, etc.
         2. La matriz de decisión
     """
 
-    mdl, x = make_gg_gurobi_model(problem)
+    if cache_dir is None:
+        mdl, x = make_gg_gurobi_model(problem, tight=tight, two_cycle=two_cycle, env=env)
+    else:
+        mdl, x = load_or_build_gurobi(problem, "gg", make_gg_gurobi_model,
+                                     cache_dir, env=env, tight=tight, two_cycle=two_cycle)
     print(f"Resolviendo {problem.name}")
     mdl.setParam("OutputFlag", 0)
     mdl.setParam("TimeLimit", time_limit)
@@ -69,7 +102,7 @@ def gg_gurobi_solve(problem: TSP, time_limit: int) -> tuple[dict, np.ndarray]:
     # Datos para el CSV
     instance = problem.name
     num_nodes = problem.n
-    model = "gg"
+    model = "gg" + ("_tight" if tight else "") + ("_2c" if two_cycle else "")
     solver ="gurobi"
     num_vars = mdl.Numvars
     num_constrs = mdl.NumConstrs
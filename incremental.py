@@ -0,0 +1,178 @@
+from docplex.mp.solution import SolveSolution
+from gg_gurobi import make_gg_gurobi_model
+from gg_cplex import make_gg_cplex_model
+from mtz_gurobi import make_mtz_gurobi_model
+from mtz_cplex import make_mtz_cplex_model
+from tsp import TSP
+from utils import gurobi_results, cplex_results
+from gurobipy import GRB
+import networkx as nx
+import numpy as np
+import copy
+
+
+class _Reoptimizer:
+    """
+    Base común: mantiene la matriz de costos, el último tour y una cota inferior válida
+    para los costos actuales.
+
+    Si cambian los costos de algunos arcos, todo tour cuesta a lo más la suma de las n
+    mayores disminuciones menos que antes, así que la cota anterior menos esa suma sigue
+    siendo válida. Si el último tour, con los costos nuevos, alcanza esa cota, es óptimo
+    y no hace falta volver a resolver; si no, la cota se entrega al solver como objetivo
+    de parada (BestObjStop en Gurobi, mip.limits.lowerobjstop en CPLEX).
+    """
+
+    def __init__(self, problem: TSP, formulation: str):
+        # Copia propia del grafo: update_costs cambia sus pesos y no debe tocar el del llamador
+        self.problem = copy.copy(problem)
+        self.problem.G = problem.G.copy()
+        self.formulation = formulation
+        self.c = nx.to_numpy_array(problem.G, nodelist=range(problem.n), weight="weight")
+        self.tour = None
+        self.bound = None
+        self.last_result = None
+
+    def _tour_arcs(self) -> list:
+        n = self.problem.n
+        return [(self.tour[t], self.tour[(t + 1) % n]) for t in range(n)]
+
+    def tour_cost(self) -> float:
+        """Costo del último tour con los costos actuales."""
+        return sum(self.c[i, j] for i, j in self._tour_arcs())
+
+    def update_costs(self, delta: dict):
+        """
+        Aplica un cambio disperso de costos {(i, j): nuevo_costo}, modificando solo los
+        coeficientes afectados de la función objetivo (y los pesos de la copia de problem.G).
+        Todos los arcos se validan antes de aplicar cualquier cambio.
+        """
+        invalid = [arc for arc in delta if arc not in self.x]
+        if invalid:
+            raise KeyError(f"Arcos inexistentes en el modelo: {invalid}")
+
+        decreases = []
+        for (i, j), cost in delta.items():
+            decreases.append(max(self.c[i, j] - cost, 0))
+            self.c[i, j] = cost
+            self.problem.G[i][j]["weight"] = cost
+            self._set_objective_coef(i, j, cost)
+
+        if self.bound is not None:
+            self.bound -= sum(sorted(decreases, reverse=True)[:self.problem.n])
+
+    def solve(self, time_limit: int) -> tuple[dict, np.ndarray]:
+        """
+        Resuelve (o re-resuelve) el problema con los costos actuales, partiendo desde el
+        último tour. Retorna lo mismo que los *_solve, con las claves extra "cota_inf"
+        y "reoptimizado" (False si la cota bastó para certificar el tour anterior).
+        """
+        if self.tour is not None and self.bound is not None and self.tour_cost() <= self.bound + 1e-6:
+            solution_dict = dict(self.last_result)
+            solution_dict["func_obj"] = self.tour_cost()
+            solution_dict["por_gap"] = "0.00%"
+            solution_dict["tiempo_(s)"] = 0.0
+            solution_dict["cota_inf"] = self.bound
+            solution_dict["reoptimizado"] = False
+
+            x_matrix = np.zeros((self.problem.n, self.problem.n))
+            for i, j in self._tour_arcs():
+                x_matrix[i, j] = 1
+            print(f"Resultado de {self.problem.name}: F.O = {solution_dict['func_obj']}, "
+                  f"tour anterior óptimo por cota")
+            return solution_dict, x_matrix
+
+        solution_dict, x_matrix, bound = self._optimize(time_limit)
+        tour = self.problem.validate_solution_matrix(x_matrix) if x_matrix.any() else None
+        if tour is not None:
+            self.tour = tour
+
+        # La cota conocida sigue siendo válida; el solver pudo detenerse al alcanzarla
+        # (BestObjStop / lowerobjstop) con una cota propia más débil
+        if bound is not None and self.bound is not None:
+            bound = max(bound, self.bound)
+        self.bound = bound
+
+        if (bound is not None and isinstance(solution_dict["func_obj"], float)
+                and solution_dict["func_obj"] <= bound + 1e-6):
+            solution_dict["por_gap"] = "0.00%"
+        self.last_result = solution_dict
+
+        solution_dict["cota_inf"] = bound
+        solution_dict["reoptimizado"] = True
+        print(f"Resultado de {self.problem.name}: F.O = {solution_dict['func_obj']}, "
+              f"Gap = {solution_dict['por_gap']}, Tiempo = {solution_dict['tiempo_(s)']:.2f}s")
+        return solution_dict, x_matrix
+
+
+class GurobiReoptimizer(_Reoptimizer):
+    """
+    Mantiene vivo un modelo GG o MTZ de Gurobi para re-optimizarlo cuando cambian costos.
+    options se entregan al constructor del modelo (tight, lifted, two_cycle, env).
+    """
+    builders = {"gg": make_gg_gurobi_model, "mtz": make_mtz_gurobi_model}
+
+    def __init__(self, problem: TSP, formulation: str = "gg", **options):
+        super().__init__(problem, formulation)
+        self.mdl, self.x = self.builders[formulation](problem, **options)
+        self.mdl.setParam("OutputFlag", 0)
+
+    def _set_objective_coef(self, i, j, cost):
+        self.x[i, j].Obj = cost
+
+    def _optimize(self, time_limit):
+        self.mdl.setParam("TimeLimit", time_limit)
+
+        # Cota conocida como pista: detenerse apenas el incumbente la alcance
+        if self.bound is not None:
+            self.mdl.setParam("BestObjStop", self.bound + 1e-6)
+        else:
+            self.mdl.setParam("BestObjStop", -GRB.INFINITY)
+
+        # MIP start con el último tour
+        if self.tour is not None:
+            tour_arcs = set(self._tour_arcs())
+            for arc, var in self.x.items():
+                var.Start = 1 if arc in tour_arcs else 0
+
+        self.mdl.optimize()
+        solution_dict, x_matrix = gurobi_results(self.mdl, self.x, self.problem, self.formulation)
+        bound = self.mdl.ObjBound if self.mdl.SolCount > 0 else None
+        return solution_dict, x_matrix, bound
+
+
+class CplexReoptimizer(_Reoptimizer):
+    """
+    Análogo a GurobiReoptimizer para docplex (options: tight, lifted, two_cycle, context).
+    """
+    builders = {"gg": make_gg_cplex_model, "mtz": make_mtz_cplex_model}
+
+    def __init__(self, problem: TSP, formulation: str = "gg", **options):
+        super().__init__(problem, formulation)
+        self.mdl, self.x = self.builders[formulation](problem, **options)
+        self.mdl.parameters.mip.display = 0
+
+    def _set_objective_coef(self, i, j, cost):
+        self.mdl.objective_expr.set_coefficient(self.x[i, j], cost)
+
+    def _optimize(self, time_limit):
+        self.mdl.set_time_limit(time_limit)
+
+        # Cota conocida como pista: detenerse apenas el incumbente la alcance
+        if self.bound is not None:
+            self.mdl.parameters.mip.limits.lowerobjstop = self.bound + 1e-6
+        else:
+            self.mdl.parameters.mip.limits.lowerobjstop.reset()
+
+        # MIP start con el último tour
+        if self.tour is not None:
+            tour_arcs = set(self._tour_arcs())
+            start = SolveSolution(self.mdl, {var: 1 if arc in tour_arcs else 0
+                                             for arc, var in self.x.items()})
+            self.mdl.clear_mip_starts()
+            self.mdl.add_mip_start(start)
+
+        sol = self.mdl.solve(log_output=False)
+        solution_dict, x_matrix = cplex_results(self.mdl, self.x, self.problem, self.formulation, sol)
+        bound = self.mdl.solve_details.best_bound if sol is not None else None
+        return solution_dict, x_matrix, bound
@@ -9,7 +9,12 @@ from gg_gurobi import gg_gurobi_solve
 from gg_cplex import gg_cplex_solve
 from mtz_gurobi import mtz_gurobi_solve
 from mtz_cplex import mtz_cplex_solve
-from utils import instance_loader
+from gg_gurobi import make_gg_gurobi_model
+from gg_cplex import make_gg_cplex_model
+from mtz_gurobi import make_mtz_gurobi_model
+from mtz_cplex import make_mtz_cplex_model
+from sweep import gurobi_sweep, cplex_sweep, param_grid
+from utils import instance_loader, gurobi_lp_bound, cplex_lp_bound, gurobi_results, cplex_results
 import networkx as nx
 import numpy as np
 
@@ -18,6 +23,7 @@ DIR_INSTANCES = CURRENT_DIR / "instances"
 DIR_INSTANCES_S = DIR_INSTANCES / "small"
 DIR_INSTANCES_M = DIR_INSTANCES / "medium"
 DIR_INSTANCES_L = DIR_INSTANCES / "large"
+DIR_CACHE = CURRENT_DIR / "cache"
 
 # Instance definitions
 small_instances = ["br17.atsp", "ftv33.atsp", "p43.atsp", "ry48p.atsp"]
@@ -103,7 +109,8 @@ def test(out_dir):
                 try:
                     # Ejecutar el solver
                     # Retorna (dict_resultados, matriz_solucion)
-                    res_dict, _ = solve_func(problem, time_limit=TIME_LIMIT)
+                    # Los modelos se leen de la caché en disco si ya fueron construidos
+                    res_dict, _ = solve_func(problem, time_limit=TIME_LIMIT, cache_dir=DIR_CACHE)
                     
                     # Mapear claves del diccionario interno al formato CSV 
                     row = {
@@ -131,7 +138,180 @@ def test(out_dir):
     print("--- Benchmark Finalizado ---")
 
 
+def sweep(out_dir):
+    """
+    Barrido de parámetros sobre las instancias medianas: cada modelo se construye
+    una sola vez y se resuelve bajo todas las configuraciones de la grilla.
+    """
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    csv_file = out_path / "barrido.csv"
+
+    fieldnames = [
+        "instancia", "num_nodos", "modelo", "solver", "config",
+        "tiempo_construccion(s)", "tiempo_copia(s)", "tiempo(s)", "por_gap", "func_obj"
+    ]
+
+    with open(csv_file, mode='w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+
+    problem_dict = instance_loader(
+        small_instances,
+        medium_instances,
+        large_instances,
+        DIR_INSTANCES_S,
+        DIR_INSTANCES_M,
+        DIR_INSTANCES_L,
+    )
+
+    TIME_LIMIT = 600
+    WORKERS = 2
+    gurobi_configs = param_grid({
+        "MIPFocus": [0, 1, 2, 3],
+        "Cuts": [-1, 0, 2],
+        "Presolve": [-1, 2],
+        "Threads": [4],
+    })
+    cplex_configs = param_grid({
+        "emphasis.mip": [0, 1, 2, 3],
+        "mip.cuts.gomory": [0, -1, 2],
+        "preprocessing.presolve": [0, 1],
+        "threads": [4],
+    })
+
+    sweeps = [
+        (gurobi_sweep, make_gg_gurobi_model, "gg", gurobi_configs),
+        (gurobi_sweep, make_mtz_gurobi_model, "mtz", gurobi_configs),
+        (cplex_sweep, make_gg_cplex_model, "gg", cplex_configs),
+        (cplex_sweep, make_mtz_cplex_model, "mtz", cplex_configs),
+    ]
+
+    for problem in problem_dict.get("medium", []):
+        for sweep_func, make_model, model_name, configs in sweeps:
+            try:
+                results = sweep_func(problem, make_model, model_name, configs,
+                                     TIME_LIMIT, workers=WORKERS)
+            except Exception as e:
+                print(f"!! Error en barrido de {problem.name} ({model_name}): {e}")
+                continue
+
+            with open(csv_file, mode='a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                for res_dict in results:
+                    writer.writerow({
+                        "instancia": res_dict.get("instancia"),
+                        "num_nodos": res_dict.get("num_nodos"),
+                        "modelo": res_dict.get("modelo"),
+                        "solver": res_dict.get("solver"),
+                        "config": res_dict.get("config"),
+                        "tiempo_construccion(s)": res_dict.get("tiempo_construccion_(s)"),
+                        "tiempo_copia(s)": res_dict.get("tiempo_copia_(s)"),
+                        "tiempo(s)": res_dict.get("tiempo_(s)"),
+                        "por_gap": res_dict.get("por_gap"),
+                        "func_obj": res_dict.get("func_obj"),
+                    })
+
+
+def _solve_built_gurobi(mdl, x, problem, model_name, time_limit) -> dict:
+    """Resuelve un modelo de Gurobi ya construido, con los mismos parámetros que gg_gurobi_solve."""
+    print(f"Resolviendo {problem.name} ({model_name} - Gurobi)")
+    mdl.setParam("OutputFlag", 0)
+    mdl.setParam("TimeLimit", time_limit)
+    mdl.optimize()
+    res_dict, _ = gurobi_results(mdl, x, problem, model_name)
+    print(f"Resultado de {problem.name}: F.O = {res_dict['func_obj']}, "
+          f"Gap = {res_dict['por_gap']}, Tiempo = {res_dict['tiempo_(s)']:.2f}s")
+    return res_dict
+
+
+def _solve_built_cplex(mdl, x, problem, model_name, time_limit) -> dict:
+    """Resuelve un modelo de docplex ya construido, con los mismos parámetros que gg_cplex_solve."""
+    print(f"Resolviendo {problem.name} ({model_name} - CPLEX)")
+    mdl.set_time_limit(time_limit)
+    mdl.parameters.mip.display = 0
+    sol = mdl.solve(log_output=False)
+    res_dict, _ = cplex_results(mdl, x, problem, model_name, sol)
+    mdl.end()
+    print(f"Resultado de {problem.name}: F.O = {res_dict['func_obj']}, "
+          f"Gap = {res_dict['por_gap']}, Tiempo = {res_dict['tiempo_(s)']:.2f}s")
+    return res_dict
+
+
+def compare_formulations(out_dir):
+    """
+    Compara las variantes reforzadas de GG y MTZ contra las originales, según la cota
+    de la relajación lineal (raíz) y el tiempo hasta optimalidad.
+    """
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    csv_file = out_path / "formulaciones.csv"
+
+    fieldnames = [
+        "instancia", "num_nodos", "modelo", "solver",
+        "cota_lp", "tiempo(s)", "por_gap", "func_obj"
+    ]
+
+    with open(csv_file, mode='w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+
+    problem_dict = instance_loader(
+        small_instances,
+        medium_instances,
+        large_instances,
+        DIR_INSTANCES_S,
+        DIR_INSTANCES_M,
+        DIR_INSTANCES_L,
+    )
+
+    TIME_LIMIT = 3600
+    # (constructor, cota LP, resolución del modelo ya construido, formulación)
+    backends = [
+        (make_gg_gurobi_model, gurobi_lp_bound, _solve_built_gurobi, "gg"),
+        (make_gg_cplex_model, cplex_lp_bound, _solve_built_cplex, "gg"),
+        (make_mtz_gurobi_model, gurobi_lp_bound, _solve_built_gurobi, "mtz"),
+        (make_mtz_cplex_model, cplex_lp_bound, _solve_built_cplex, "mtz"),
+    ]
+    # lifted ya implica x_ij + x_ji <= 1, así que MTZ no se combina con two_cycle
+    options_by_formulation = {
+        "gg": [{}, {"tight": True}, {"tight": True, "two_cycle": True}],
+        "mtz": [{}, {"lifted": True}],
+    }
+    suffixes = {"tight": "_tight", "lifted": "_dl", "two_cycle": "_2c"}
+
+    for category in ["small", "medium"]:
+        for problem in problem_dict.get(category, []):
+            for make_model, lp_bound, solve_built, formulation in backends:
+                for options in options_by_formulation[formulation]:
+                    model_name = formulation + "".join(
+                        suf for k, suf in suffixes.items() if options.get(k)
+                    )
+                    try:
+                        # La cota y la resolución usan el mismo modelo, construido una vez
+                        mdl, x = make_model(problem, **options)
+                        bound = lp_bound(mdl)
+                        res_dict = solve_built(mdl, x, problem, model_name, TIME_LIMIT)
+                    except Exception as e:
+                        print(f"!! Error resolviendo {problem.name} con {make_model.__name__}: {e}")
+                        continue
+
+                    with open(csv_file, mode='a', newline='', encoding='utf-8') as f:
+                        writer = csv.DictWriter(f, fieldnames=fieldnames)
+                        writer.writerow({
+                            "instancia": res_dict.get("instancia"),
+                            "num_nodos": res_dict.get("num_nodos"),
+                            "modelo": res_dict.get("modelo"),
+                            "solver": res_dict.get("solver"),
+                            "cota_lp": bound,
+                            "tiempo(s)": res_dict.get("tiempo_(s)"),
+                            "por_gap": res_dict.get("por_gap"),
+                            "func_obj": res_dict.get("func_obj"),
+                        })
+
 if __name__ == "__main__":
     # Ejecuta el benchmark y guarda en la carpeta 'resultados'
     #test("resultados")
+    #sweep("resultados")
+    #compare_formulations("resultados")
     visualize_pathological("images")
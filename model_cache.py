@@ -0,0 +1,101 @@
+from docplex.mp.model_reader import ModelReader
+from pathlib import Path
+from tsp import TSP
+import gurobipy as gp
+import networkx as nx
+import hashlib
+import inspect
+import json
+
+def instance_hash(problem: TSP) -> str:
+    """
+    Hash de la instancia a partir de su matriz de costos (independiente del nombre del archivo).
+    """
+    c = nx.to_numpy_array(problem.G, nodelist=range(problem.n), weight="weight")
+    return hashlib.sha256(c.tobytes()).hexdigest()[:16]
+
+
+def builder_hash(make_model) -> str:
+    """
+    Versión del constructor: hash de su código fuente, así cualquier cambio en un
+    make_*_model invalida automáticamente los modelos ya guardados.
+    """
+    return hashlib.sha256(inspect.getsource(make_model).encode("utf-8")).hexdigest()[:8]
+
+
+def cache_key(problem: TSP, formulation: str, backend: str, make_model, **options) -> str:
+    """
+    Llave del modelo en caché: instancia + formulación + backend + opciones + versión del
+    constructor + hash de la instancia, e.g. "ftv64_gg_gurobi_tight=True_<ver>_<hash>".
+    El backend es parte de la llave porque los constructores de Gurobi y CPLEX no generan
+    el mismo modelo (e.g. MTZ usa cotas y big-M distintos en cada uno).
+    """
+    opts = "_".join(f"{k}={v}" for k, v in sorted(options.items()) if v)
+    parts = [problem.name, formulation, backend, opts, builder_hash(make_model),
+             instance_hash(problem)]
+    return "_".join(p for p in parts if p)
+
+
+def _cache_paths(problem: TSP, formulation: str, backend: str, make_model, cache_dir,
+                 **options) -> tuple[Path, Path]:
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = cache_key(problem, formulation, backend, make_model, **options)
+    return cache_dir / f"{key}.mps.gz", cache_dir / f"{key}.json"
+
+
+def _write_index(index_path: Path, x, name_of):
+    """Guarda el índice nombre de variable -> arco para las variables x."""
+    index = [[name_of(var), i, j] for (i, j), var in x.items()]
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+
+def _read_index(index_path: Path) -> list:
+    with open(index_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_or_build_gurobi(problem: TSP, formulation: str, make_model,
+                         cache_dir, env=None, **options) -> tuple:
+    """
+    Retorna (modelo, x) de Gurobi. Si el modelo de esta instancia/formulación/opciones ya
+    está en caché se lee directamente del MPS; si no, se construye con make_model y se exporta.
+    El modelo se crea en env.
+    """
+    mps_path, index_path = _cache_paths(problem, formulation, "gurobi", make_model,
+                                        cache_dir, **options)
+
+    if mps_path.exists() and index_path.exists():
+        mdl = gp.read(str(mps_path), env)
+        mdl.ModelName = f"{formulation}_{problem.name}"
+        by_name = {var.VarName: var for var in mdl.getVars()}
+        x = {(i, j): by_name[name] for name, i, j in _read_index(index_path)}
+        return mdl, x
+
+    mdl, x = make_model(problem, env=env, **options)
+    mdl.update()
+    mdl.write(str(mps_path))
+    _write_index(index_path, x, lambda var: var.VarName)
+    return mdl, x
+
+
+def load_or_build_cplex(problem: TSP, formulation: str, make_model,
+                        cache_dir, context=None, **options) -> tuple:
+    """
+    Análogo a load_or_build_gurobi para docplex, con el modelo creado en context.
+    """
+    mps_path, index_path = _cache_paths(problem, formulation, "cplex", make_model,
+                                        cache_dir, **options)
+
+    if mps_path.exists() and index_path.exists():
+        mdl = ModelReader.read(str(mps_path), model_name=f"{formulation}_cplex_{problem.name}",
+                               context=context)
+        by_name = {var.name: var for var in mdl.iter_variables()}
+        x = {(i, j): by_name[name] for name, i, j in _read_index(index_path)}
+        return mdl, x
+
+    mdl, x = make_model(problem, context=context, **options)
+    mdl.export_as_mps(str(mps_path))
+    _write_index(index_path, x, lambda var: var.name)
+    return mdl, x
@@ -1,10 +1,16 @@
 from docplex.mp.model import Model
 from tsp import TSP
+from model_cache import load_or_build_cplex
 import networkx as nx
 import numpy as np
 
-def make_mtz_cplex_model(problem: TSP):
-    mdl = Model(name=f"mtz_cplex_{problem.name}")
+def make_mtz_cplex_model(problem: TSP, lifted: bool = False, two_cycle: bool = False,
+                         context=None):
+    """
+    Modelo MTZ en docplex. lifted y two_cycle seleccionan la variante reforzada,
+    igual que en make_mtz_gurobi_model. context permite reutilizar un contexto de docplex.
+    """
+    mdl = Model(name=f"mtz_cplex_{problem.name}", context=context)
 
     # --------------- Parametros ---------------
     G = problem.G
@@ -45,11 +51,37 @@ def make_mtz_cplex_model(problem: TSP):
     # Restricción MTZ estándar: u_i - u_j + n * x_ij <= n - 1
     # Aplica para todo i, j != 0
     for i, j in G.edges():
-        if i != 0 and j != 0:
+        if i == 0 or j == 0:
+            continue
+        if not lifted:
             mdl.add_constraint(
                 u[i] - u[j] + n * x[i, j] <= n - 1,
                 ctname=f"mtz_{i}_{j}"
             )
+            continue
+
+        # Levantamiento de Desrochers-Laporte
+        lift = (n - 3) * x[j, i] if i != j and G.has_edge(j, i) else 0
+        mdl.add_constraint(
+            u[i] - u[j] + (n - 1) * x[i, j] + lift <= n - 2,
+            ctname=f"mtz_{i}_{j}"
+        )
+
+    # Cotas de Desrochers-Laporte (u_0 = 1, por lo que las posiciones van de 2 a n)
+    if lifted:
+        for i in G.nodes():
+            if i == 0:
+                continue
+            x_0i = x.get((0, i), 0)
+            x_i0 = x.get((i, 0), 0)
+            mdl.add_constraint(u[i] >= 3 - x_0i + (n - 3) * x_i0, ctname=f"dl_lb_{i}")
+            mdl.add_constraint(u[i] <= n - 1 + x_i0 - (n - 3) * x_0i, ctname=f"dl_ub_{i}")
+
+    # 3. Eliminación de 2-ciclos
+    if two_cycle:
+        for i, j in G.edges():
+            if i < j and G.has_edge(j, i):
+                mdl.add_constraint(x[i, j] + x[j, i] <= 1, ctname=f"two_cycle_{i}_{j}")
 
     # -------------- Función Objetivo --------------
     mdl.minimize(
@@ -58,8 +90,14 @@ def make_mtz_cplex_model(problem: TSP):
 
     return mdl, x
 
-def mtz_cplex_solve(problem: TSP, time_limit: int) -> tuple[dict, np.ndarray]:
-    mdl, x = make_mtz_cplex_model(problem)
+def mtz_cplex_solve(problem: TSP, time_limit: int, lifted: bool = False,
+                    two_cycle: bool = False, cache_dir=None,
+                    context=None) -> tuple[dict, np.ndarray]:
+    if cache_dir is None:
+        mdl, x = make_mtz_cplex_model(problem, lifted=lifted, two_cycle=two_cycle, context=context)
+    else:
+        mdl, x = load_or_build_cplex(problem, "mtz", make_mtz_cplex_model,
+                                    cache_dir, context=context, lifted=lifted, two_cycle=two_cycle)
     print(f"Resolviendo {problem.name} (MTZ - CPLEX)...")
 
     mdl.set_time_limit(time_limit)
@@ -70,7 +108,7 @@ def mtz_cplex_solve(problem: TSP, time_limit: int) -> tuple[dict, np.ndarray]:
     # Metadata básica
     instance = problem.name
     num_nodes = problem.n
-    model_name = "mtz"
+    model_name = "mtz" + ("_dl" if lifted else "") + ("_2c" if two_cycle else "")
     solver_name = "cplex"
     num_vars = mdl.number_of_variables
     num_constrs = mdl.number_of_constraints
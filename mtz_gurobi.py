@@ -1,16 +1,21 @@
 # mtz_gurobi.py
 from gurobipy import *
+from model_cache import load_or_build_gurobi
 import networkx as nx
 import numpy as np
 
 
-def make_mtz_gurobi_model(problem):
+def make_mtz_gurobi_model(problem, lifted=False, two_cycle=False, env=None):
     """
     Construye un modelo Gurobi para ATSP usando la formulación MTZ.
+    Con lifted=True se usa el levantamiento de Desrochers-Laporte, junto con cotas
+    de u_i ajustadas por los arcos desde/hacia la raíz.
+    Con two_cycle=True se agregan las desigualdades x_ij + x_ji <= 1.
+    El modelo se crea en env (o en el entorno por defecto si es None).
     Retorna: modelo, x (vars binarias)
     """
 
-    mdl = Model(f"mtz_{problem.name}")
+    mdl = Model(f"mtz_{problem.name}", env=env)
 
     G = problem.G
     n = problem.n
@@ -38,9 +43,27 @@ def make_mtz_gurobi_model(problem):
     for i, j in G.edges():
         if i == 0 or j == 0:
             continue
-        mdl.addConstr(u[i] - u[j] + M * x[i, j] <= n - 2,
+        lift = (n - 3) * x[j, i] if lifted and i != j and G.has_edge(j, i) else 0
+        mdl.addConstr(u[i] - u[j] + M * x[i, j] + lift <= n - 2,
                       name=f"mtz_{i}_{j}")
 
+    # --- COTAS DESROCHERS-LAPORTE ---
+    # Si i sigue a la raíz su posición es 1, si la precede es n - 1
+    if lifted:
+        for i in G.nodes():
+            if i == 0:
+                continue
+            x_0i = x.get((0, i), 0)
+            x_i0 = x.get((i, 0), 0)
+            mdl.addConstr(u[i] >= 2 - x_0i + (n - 3) * x_i0, name=f"dl_lb_{i}")
+            mdl.addConstr(u[i] <= n - 2 + x_i0 - (n - 3) * x_0i, name=f"dl_ub_{i}")
+
+    # --- ELIMINACIÓN DE 2-CICLOS ---
+    if two_cycle:
+        for i, j in G.edges():
+            if i < j and G.has_edge(j, i):
+                mdl.addConstr(x[i, j] + x[j, i] <= 1, name=f"two_cycle_{i}_{j}")
+
     # --- OBJETIVO ---
     mdl.setObjective(quicksum(c[i, j] * x[i, j] for i, j in G.edges()),
                      GRB.MINIMIZE)
@@ -49,15 +72,23 @@ def make_mtz_gurobi_model(problem):
 
 
 
-def mtz_gurobi_solve(problem, time_limit: int):
+def mtz_gurobi_solve(problem, time_limit: int, lifted=False, two_cycle=False, cache_dir=None,
+                     env=None):
     """
     Resuelve ATSP usando MTZ + Gurobi.
+    lifted y two_cycle seleccionan la variante reforzada (ver make_mtz_gurobi_model).
+    Si se entrega cache_dir, el modelo se lee/guarda en la caché en disco (ver model_cache).
+    env permite reutilizar un entorno de Gurobi ya iniciado (ver session).
     Retorna:
       1. diccionario con resultados
       2. matriz x[i][j]
     """
 
-    mdl, x = make_mtz_gurobi_model(problem)
+    if cache_dir is None:
+        mdl, x = make_mtz_gurobi_model(problem, lifted=lifted, two_cycle=two_cycle, env=env)
+    else:
+        mdl, x = load_or_build_gurobi(problem, "mtz", make_mtz_gurobi_model,
+                                     cache_dir, env=env, lifted=lifted, two_cycle=two_cycle)
 
     mdl.setParam("TimeLimit", time_limit)
     mdl.setParam("OutputFlag", 0)
@@ -66,7 +97,7 @@ def mtz_gurobi_solve(problem, time_limit: int):
     # --- Datos base ---
     instance = problem.name
     n = problem.n
-    model_name = "mtz"
+    model_name = "mtz" + ("_dl" if lifted else "") + ("_2c" if two_cycle else "")
     solver = "gurobi"
 
     num_vars = mdl.NumVars
@@ -0,0 +1,190 @@
+from docplex.mp.context import Context
+from gg_gurobi import make_gg_gurobi_model
+from gg_cplex import make_gg_cplex_model
+from model_cache import load_or_build_gurobi, load_or_build_cplex
+from mtz_gurobi import make_mtz_gurobi_model
+from mtz_cplex import make_mtz_cplex_model
+from utils import gurobi_results, cplex_results, set_cplex_param
+import gurobipy as gp
+import networkx as nx
+import numpy as np
+import time
+
+
+class _Session:
+    """
+    Base común de las sesiones: mide el overhead de cada resolución (tiempo total de
+    construcción + resolución menos el tiempo reportado por el solver).
+    """
+
+    def __init__(self):
+        self.num_solves = 0
+        self.total_time = 0.0
+        self.total_overhead = 0.0
+
+    def _timed(self, run, *args, **kwargs) -> tuple[dict, np.ndarray]:
+        start = time.perf_counter()
+        solution_dict, x_matrix = run(*args, **kwargs)
+        total = time.perf_counter() - start
+
+        solution_dict["tiempo_total_(s)"] = total
+        solution_dict["overhead_(s)"] = total - solution_dict["tiempo_(s)"]
+
+        self.num_solves += 1
+        self.total_time += total
+        self.total_overhead += solution_dict["overhead_(s)"]
+        return solution_dict, x_matrix
+
+    @staticmethod
+    def _model_name(formulation: str, options: dict) -> str:
+        suffixes = {"tight": "_tight", "lifted": "_dl", "two_cycle": "_2c"}
+        return formulation + "".join(suf for k, suf in suffixes.items() if options.get(k))
+
+    def solve_many(self, problems, formulation: str = "gg", time_limit: int = 60, **options):
+        """
+        Resuelve una secuencia (o iterable) de problemas TSP, entregando los resultados
+        a medida que se obtienen.
+        """
+        for problem in problems:
+            yield self.solve(problem, formulation, time_limit, **options)
+
+    def summary(self) -> dict:
+        """Resumen del overhead acumulado de la sesión."""
+        mean = self.total_overhead / self.num_solves if self.num_solves else 0.0
+        print(f"Sesión: {self.num_solves} resoluciones, inicio = {self.setup_time:.3f}s, "
+              f"overhead medio = {mean * 1000:.2f}ms")
+        return {
+            "resoluciones": self.num_solves,
+            "tiempo_inicio_(s)": self.setup_time,
+            "tiempo_total_(s)": self.total_time,
+            "overhead_total_(s)": self.total_overhead,
+            "overhead_medio_(s)": mean,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GurobiSession(_Session):
+    """
+    Mantiene un único gurobipy.Env abierto (licencia incluida) para resolver muchos
+    problemas seguidos sin pagar la creación del entorno en cada uno.
+    options: tight, lifted, two_cycle (ver make_*_gurobi_model) y cache_dir (ver model_cache).
+    """
+    builders = {"gg": make_gg_gurobi_model, "mtz": make_mtz_gurobi_model}
+
+    def __init__(self, params: dict | None = None):
+        super().__init__()
+        start = time.perf_counter()
+        self.env = gp.Env(empty=True)
+        self.env.setParam("OutputFlag", 0)
+        for name, value in (params or {}).items():
+            self.env.setParam(name, value)
+        self.env.start()
+        self.setup_time = time.perf_counter() - start
+
+    def _run(self, problem, formulation: str, time_limit: int, cache_dir=None,
+             **options) -> tuple[dict, np.ndarray]:
+        make_model = self.builders[formulation]
+        if cache_dir is None:
+            mdl, x = make_model(problem, env=self.env, **options)
+        else:
+            mdl, x = load_or_build_gurobi(problem, formulation, make_model, cache_dir,
+                                          env=self.env, **options)
+
+        try:
+            mdl.setParam("TimeLimit", time_limit)
+            mdl.optimize()
+            return gurobi_results(mdl, x, problem, self._model_name(formulation, options))
+        finally:
+            mdl.dispose()
+
+    def solve(self, problem, formulation: str = "gg", time_limit: int = 60,
+              **options) -> tuple[dict, np.ndarray]:
+        return self._timed(self._run, problem, formulation, time_limit, **options)
+
+    def close(self):
+        self.env.dispose()
+
+
+class CplexSession(_Session):
+    """
+    Mantiene vivo un modelo de docplex (y con él su motor de CPLEX) por cada forma de
+    problema: formulación, número de nodos y opciones. Como las restricciones GG/MTZ solo
+    dependen de los arcos, un problema nuevo con los mismos arcos reutiliza el modelo y
+    solo se reemplaza la función objetivo; si cambian los arcos, el modelo se reconstruye.
+    Acepta las mismas options que GurobiSession.
+    """
+    builders = {"gg": make_gg_cplex_model, "mtz": make_mtz_cplex_model}
+
+    def __init__(self, params: dict | None = None):
+        super().__init__()
+        start = time.perf_counter()
+        self.context = Context.make_default_context()
+        for name, value in (params or {}).items():
+            set_cplex_param(self.context.cplex_parameters, name, value)
+        # (formulación, n, opciones) -> (modelo, x, arcos)
+        self.models = {}
+        self.num_builds = 0
+        self.setup_time = time.perf_counter() - start
+
+    def _model_for(self, problem, formulation: str, cache_dir, options: dict) -> tuple:
+        """
+        Retorna (modelo, x, reutilizado) para el problema, reutilizando el modelo vivo de la
+        misma forma si tiene exactamente los mismos arcos.
+        """
+        key = (formulation, problem.n, tuple(sorted(options.items())))
+        arcs = list(problem.G.edges())
+
+        cached = self.models.get(key)
+        if cached is not None and cached[2] == arcs:
+            return cached[0], cached[1], True
+        if cached is not None:
+            cached[0].end()
+
+        make_model = self.builders[formulation]
+        if cache_dir is None:
+            mdl, x = make_model(problem, context=self.context, **options)
+        else:
+            mdl, x = load_or_build_cplex(problem, formulation, make_model, cache_dir,
+                                         context=self.context, **options)
+        mdl.parameters.mip.display = 0
+        self.models[key] = (mdl, x, arcs)
+        self.num_builds += 1
+        return mdl, x, False
+
+    def _run(self, problem, formulation: str, time_limit: int, cache_dir=None,
+             **options) -> tuple[dict, np.ndarray]:
+        mdl, x, reused = self._model_for(problem, formulation, cache_dir, options)
+
+        if reused:
+            # Misma estructura: solo cambian los costos
+            c = nx.to_numpy_array(problem.G, nodelist=range(problem.n), weight="weight")
+            arcs = list(x.keys())
+            mdl.minimize(mdl.scal_prod([x[arc] for arc in arcs], [c[i, j] for i, j in arcs]))
+
+        mdl.set_time_limit(time_limit)
+        sol = mdl.solve(log_output=False)
+
+        solution_dict, x_matrix = cplex_results(mdl, x, problem,
+                                                self._model_name(formulation, options), sol)
+        solution_dict["modelo_reutilizado"] = reused
+        return solution_dict, x_matrix
+
+    def solve(self, problem, formulation: str = "gg", time_limit: int = 60,
+              **options) -> tuple[dict, np.ndarray]:
+        return self._timed(self._run, problem, formulation, time_limit, **options)
+
+    def summary(self) -> dict:
+        stats = super().summary()
+        print(f"Modelos/motores de CPLEX creados: {self.num_builds}")
+        stats["modelos_construidos"] = self.num_builds
+        return stats
+
+    def close(self):
+        for mdl, _, _ in self.models.values():
+            mdl.end()
+        self.models = {}
@@ -0,0 +1,229 @@
+from tsp import TSP
+from mtz_gurobi import make_mtz_gurobi_model
+from utils import gurobi_results
+from gurobipy import GRB, Column
+import networkx as nx
+import numpy as np
+import time
+
+
+def candidate_arcs(problem: TSP, k: int, tour: list | None = None) -> set:
+    """
+    Retorna el conjunto de arcos candidatos: los k arcos salientes y entrantes más baratos
+    de cada nodo, más los arcos del tour entregado (para garantizar factibilidad).
+    """
+    n = problem.n
+    c = nx.to_numpy_array(problem.G, nodelist=range(n), weight="weight", nonedge=np.inf)
+    np.fill_diagonal(c, np.inf)
+
+    out_best = np.argsort(c, axis=1)[:, :k]
+    in_best = np.argsort(c, axis=0)[:k, :]
+
+    arcs = {(i, int(j)) for i in range(n) for j in out_best[i]}
+    arcs |= {(int(i), j) for j in range(n) for i in in_best[:, j]}
+
+    if tour is not None:
+        arcs |= {(tour[t], tour[(t + 1) % n]) for t in range(n)}
+
+    return {(i, j) for i, j in arcs if i != j and problem.G.has_edge(i, j)}
+
+
+def _lifted_rows(mdl, n: int) -> dict:
+    """
+    Retorna las filas del modelo MTZ levantado de make_mtz_gurobi_model, por nombre:
+    grado ("out", "in"), cotas de Desrochers-Laporte ("dl_lb", "dl_ub") y MTZ por arco ("mtz").
+    """
+    mdl.update()
+    by_name = {constr.ConstrName: constr for constr in mdl.getConstrs()}
+    rows = {
+        "out": [by_name[f"out_{i}"] for i in range(n)],
+        "in": [by_name[f"in_{i}"] for i in range(n)],
+        "dl_lb": [by_name.get(f"dl_lb_{i}") for i in range(n)],
+        "dl_ub": [by_name.get(f"dl_ub_{i}") for i in range(n)],
+        "mtz": {},
+    }
+    for name, constr in by_name.items():
+        if name.startswith("mtz_"):
+            _, i, j = name.split("_")
+            rows["mtz"][int(i), int(j)] = constr
+    return rows
+
+
+def _add_arc(mdl, x: dict, u: list, rows: dict, n: int, cost: float, i: int, j: int):
+    """
+    Agrega el arco (i, j) al modelo vivo, con los mismos coeficientes que usaría
+    make_mtz_gurobi_model(lifted=True): su columna en las filas existentes y su fila MTZ.
+    """
+    coeffs = [1.0, 1.0]
+    constrs = [rows["out"][i], rows["in"][j]]
+
+    if i == 0:
+        # dl_lb_j: u_j + x_0j - (n-3) x_j0 >= 2 ; dl_ub_j: u_j - x_j0 + (n-3) x_0j <= n-2
+        coeffs += [1.0, n - 3.0]
+        constrs += [rows["dl_lb"][j], rows["dl_ub"][j]]
+    elif j == 0:
+        coeffs += [-(n - 3.0), -1.0]
+        constrs += [rows["dl_lb"][i], rows["dl_ub"][i]]
+    elif (j, i) in rows["mtz"]:
+        # Levantamiento del arco inverso ya presente
+        coeffs.append(n - 3.0)
+        constrs.append(rows["mtz"][j, i])
+
+    var = mdl.addVar(obj=cost, vtype=GRB.BINARY, name=f"x[{i},{j}]",
+                     column=Column(coeffs, constrs))
+    x[i, j] = var
+
+    if i != 0 and j != 0:
+        lift = (n - 3) * x[j, i] if (j, i) in x else 0
+        rows["mtz"][i, j] = mdl.addConstr(u[i] - u[j] + (n - 1) * var + lift <= n - 2,
+                                          name=f"mtz_{i}_{j}")
+
+
+def _reduced_costs(mdl, rows: dict, c: np.ndarray, n: int) -> tuple[float, np.ndarray] | None:
+    """
+    Resuelve la relajación lineal del modelo vivo y retorna (z_LP, rc), donde rc[i, j] es
+    el costo reducido que tendría la columna del arco (i, j) si se agregara. Las filas MTZ
+    nuevas de un arco podado tienen dual nulo; el resto de su columna (grado, levantamiento
+    del arco inverso y cotas DL) se toma de los duales actuales.
+    Retorna None si la relajación no es óptima.
+    """
+    mdl.update()
+    relaxed = mdl.relax()
+    # La relajación hereda el TimeLimit restante (que puede ser 0); el LP es barato
+    relaxed.setParam("TimeLimit", GRB.INFINITY)
+    relaxed.optimize()
+    if relaxed.Status != GRB.OPTIMAL:
+        relaxed.dispose()
+        return None
+
+    lower = relaxed.ObjVal
+    pi = relaxed.getAttr("Pi", relaxed.getConstrs())
+    relaxed.dispose()
+
+    def dual(constr):
+        return pi[constr.index] if constr is not None else 0.0
+
+    pi_out = np.array([dual(constr) for constr in rows["out"]])
+    pi_in = np.array([dual(constr) for constr in rows["in"]])
+    pi_lb = np.array([dual(constr) for constr in rows["dl_lb"]])
+    pi_ub = np.array([dual(constr) for constr in rows["dl_ub"]])
+    pi_mtz = np.zeros((n, n))
+    for (i, j), constr in rows["mtz"].items():
+        pi_mtz[i, j] = dual(constr)
+
+    rc = c - pi_out[:, None] - pi_in[None, :] - (n - 3) * pi_mtz.T
+    rc[0, :] -= pi_lb + (n - 3) * pi_ub
+    rc[:, 0] += (n - 3) * pi_lb + pi_ub
+    return lower, rc
+
+
+def sparse_mtz_gurobi_solve(problem: TSP, time_limit: int, k: int = 5,
+                            max_iter: int = 20) -> tuple[dict, np.ndarray]:
+    """
+    Resuelve el ATSP con MTZ levantado (Desrochers-Laporte) + Gurobi sobre un grafo
+    disperso de arcos candidatos.
+
+    Tras resolver el MIP restringido se calculan los costos reducidos de los arcos podados
+    con los duales de su relajación lineal: ningún tour que use un arco (i, j) podado puede
+    costar menos que z_LP + rc_ij, así que si todo arco podado cumple z_LP + rc_ij >= F.O.
+    la solución es óptima en el grafo completo. Si no, esos arcos se agregan al modelo vivo
+    (columna + fila MTZ, sin reconstruirlo) y se repite. Se usa la formulación levantada
+    porque su relajación es bastante más fuerte que la de MTZ base, y agrega menos arcos.
+
+    Retorna lo mismo que los *_solve, con las claves extra "arcos_activos", "iteraciones"
+    y "certificado". Si la solución no queda certificada, el gap se reporta como "N/A",
+    ya que el del MIP restringido no dice nada sobre el grafo completo.
+    """
+    if max_iter < 1:
+        raise ValueError(f"max_iter debe ser al menos 1 (se recibió {max_iter})")
+
+    start = time.perf_counter()
+    n = problem.n
+    c = nx.to_numpy_array(problem.G, nodelist=range(n), weight="weight")
+    existing = nx.to_numpy_array(problem.G, nodelist=range(n), weight=None) > 0
+    np.fill_diagonal(existing, False)
+
+    print(f"Resolviendo {problem.name} (MTZ disperso - Gurobi)")
+
+    tour = problem.nearest_neighbor_tour()
+    arcs = candidate_arcs(problem, k, tour)
+
+    sub = problem.restricted(arcs)
+    mdl, x = make_mtz_gurobi_model(sub, lifted=True)
+    mdl.setParam("OutputFlag", 0)
+    rows = _lifted_rows(mdl, n)
+    u = [mdl.getVarByName(f"u[{i}]") for i in range(n)]
+
+    certified = False
+    solution_dict, x_matrix = None, np.zeros((n, n))
+    iteration = 0
+
+    while iteration < max_iter:
+        iteration += 1
+        mdl.setParam("TimeLimit", max(time_limit - (time.perf_counter() - start), 0))
+
+        # Partimos desde el mejor tour conocido
+        tour_arcs = {(tour[t], tour[(t + 1) % n]) for t in range(n)}
+        for arc, var in x.items():
+            var.Start = 1 if arc in tour_arcs else 0
+
+        mdl.optimize()
+        if mdl.SolCount == 0:
+            break
+
+        solution_dict, x_matrix = gurobi_results(mdl, x, sub, "mtz_sparse")
+        tour = problem.validate_solution_matrix(x_matrix) or tour
+        upper = mdl.ObjVal
+
+        # Costos reducidos de los arcos podados según los duales de la relajación
+        priced = _reduced_costs(mdl, rows, c, n)
+        if priced is None:
+            break
+        lower, rc = priced
+
+        active = np.zeros((n, n), dtype=bool)
+        for i, j in x.keys():
+            active[i, j] = True
+
+        improving = existing & ~active & (rc < upper - lower - 1e-6)
+        print(f"Iteración {iteration}: {len(x)} arcos, F.O = {upper}, "
+              f"cota LP = {lower:.2f}, arcos a agregar = {improving.sum()}")
+
+        if not improving.any():
+            certified = mdl.Status == GRB.OPTIMAL
+            break
+
+        if time.perf_counter() - start >= time_limit:
+            break
+
+        for i, j in zip(*np.nonzero(improving)):
+            _add_arc(mdl, x, u, rows, n, c[i, j], int(i), int(j))
+
+    cpu_time = time.perf_counter() - start
+
+    if solution_dict is None:
+        solution_dict = {
+            "instancia": problem.name,
+            "num_nodos": n,
+            "modelo": "mtz_sparse",
+            "solver": "gurobi",
+            "num_vars": mdl.NumVars,
+            "num_rest": mdl.NumConstrs,
+            "func_obj": "N/A",
+        }
+
+    if not certified:
+        solution_dict["por_gap"] = "N/A"
+
+    solution_dict["tiempo_(s)"] = cpu_time
+    solution_dict["arcos_activos"] = len(x)
+    solution_dict["iteraciones"] = iteration
+    solution_dict["certificado"] = certified
+
+    print(
+        f"Resultado de {problem.name}: F.O = {solution_dict['func_obj']}, "
+        f"Gap = {solution_dict['por_gap']}, Tiempo = {cpu_time:.2f}s, Certificado = {certified}"
+    )
+
+    mdl.dispose()
+    return solution_dict, x_matrix
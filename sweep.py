@@ -0,0 +1,182 @@
+from concurrent.futures import ThreadPoolExecutor
+from tsp import TSP
+from utils import gurobi_results, cplex_results, set_cplex_param, reset_cplex_param
+import gurobipy as gp
+import itertools
+import math
+import queue
+import random
+import time
+
+
+def param_grid(grid: dict) -> list[dict]:
+    """
+    Expande una grilla de parámetros {nombre: [valores]} en la lista de todas
+    las combinaciones posibles.
+    """
+    names = list(grid.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def param_random(space: dict, num_samples: int, seed: int = 0) -> list[dict]:
+    """
+    Muestrea num_samples configuraciones al azar (sin repetir) del espacio
+    {nombre: [valores]}, eligiendo cada parámetro por separado para no enumerar la grilla.
+    Si el espacio tiene menos configuraciones que num_samples, se retornan todas.
+    """
+    rng = random.Random(seed)
+    names = list(space.keys())
+    target = min(num_samples, math.prod(len(set(values)) for values in space.values()))
+
+    seen = set()
+    configs = []
+    while len(configs) < target:
+        values = tuple(rng.choice(space[name]) for name in names)
+        if values in seen:
+            continue
+        seen.add(values)
+        configs.append(dict(zip(names, values)))
+
+    return configs
+
+
+def _config_str(config: dict) -> str:
+    return ";".join(f"{k}={v}" for k, v in config.items()) or "default"
+
+
+def _run_queue(solve, copies: list, configs: list[dict]) -> list[dict]:
+    """
+    Resuelve las configuraciones en paralelo, una hebra por copia del modelo. Cada hebra
+    toma la siguiente configuración pendiente de una cola compartida, así ninguna queda
+    ociosa mientras otra tiene trabajo acumulado. Los resultados mantienen el orden de configs.
+    """
+    pending = queue.Queue()
+    for idx, config in enumerate(configs):
+        pending.put((idx, config))
+    results = [None] * len(configs)
+
+    def worker(copy):
+        while True:
+            try:
+                idx, config = pending.get_nowait()
+            except queue.Empty:
+                return
+            results[idx] = solve(copy, config)
+
+    with ThreadPoolExecutor(max_workers=len(copies)) as pool:
+        list(pool.map(worker, copies))
+
+    return results
+
+
+def gurobi_sweep(problem: TSP, make_model, model_name: str, configs: list[dict],
+                 time_limit: int, workers: int = 1, **options) -> list[dict]:
+    """
+    Construye el modelo de Gurobi una única vez y lo resuelve bajo cada configuración
+    de parámetros en configs. Con workers > 1 se resuelven varias copias del modelo en
+    paralelo, cada una en su propio entorno.
+    Retorna una lista con el diccionario de resultados de cada configuración.
+    """
+    start = time.perf_counter()
+    mdl, x = make_model(problem, **options)
+    mdl.update()
+    build_time = time.perf_counter() - start
+
+    print(f"Modelo {model_name} de {problem.name} construido en {build_time:.2f}s, "
+          f"{len(configs)} configuraciones")
+
+    def solve(copy, config):
+        copy_mdl, copy_x, copy_time = copy
+        copy_mdl.reset(1)
+        copy_mdl.resetParams()
+        copy_mdl.setParam("OutputFlag", 0)
+        copy_mdl.setParam("TimeLimit", time_limit)
+        for name, value in config.items():
+            copy_mdl.setParam(name, value)
+        copy_mdl.optimize()
+
+        solution_dict, _ = gurobi_results(copy_mdl, copy_x, problem, model_name)
+        solution_dict["config"] = _config_str(config)
+        solution_dict["tiempo_construccion_(s)"] = build_time
+        solution_dict["tiempo_copia_(s)"] = copy_time
+        print(f"[{solution_dict['config']}] F.O = {solution_dict['func_obj']}, "
+              f"Gap = {solution_dict['por_gap']}, Tiempo = {solution_dict['tiempo_(s)']:.2f}s")
+        return solution_dict
+
+    if workers <= 1:
+        return [solve((mdl, x, 0.0), config) for config in configs]
+
+    # Gurobi no permite optimizar concurrentemente modelos de un mismo entorno,
+    # así que cada copia vive en un entorno propio
+    envs = []
+    copies = []
+    try:
+        for _ in range(workers):
+            env = gp.Env(params={"OutputFlag": 0})
+            envs.append(env)
+
+            start = time.perf_counter()
+            copy_mdl = mdl.copy(env)
+            copy_vars = copy_mdl.getVars()
+            copy_x = {arc: copy_vars[var.index] for arc, var in x.items()}
+            copies.append((copy_mdl, copy_x, time.perf_counter() - start))
+
+        return _run_queue(solve, copies, configs)
+    finally:
+        for copy_mdl, _, _ in copies:
+            copy_mdl.dispose()
+        for env in envs:
+            env.dispose()
+
+
+def cplex_sweep(problem: TSP, make_model, model_name: str, configs: list[dict],
+                time_limit: int, workers: int = 1, **options) -> list[dict]:
+    """
+    Construye el modelo de docplex una única vez y lo resuelve bajo cada configuración de
+    parámetros (rutas con puntos, e.g. {"emphasis.mip": 2}). Con workers > 1 se clona el
+    modelo una vez por hebra y los clones se reutilizan entre configuraciones.
+    """
+    start = time.perf_counter()
+    mdl, x = make_model(problem, **options)
+    build_time = time.perf_counter() - start
+
+    print(f"Modelo {model_name} de {problem.name} construido en {build_time:.2f}s, "
+          f"{len(configs)} configuraciones")
+
+    def solve(copy, config):
+        copy_mdl, copy_x, copy_time = copy
+        copy_mdl.set_time_limit(time_limit)
+        copy_mdl.parameters.mip.display = 0
+        for name, value in config.items():
+            set_cplex_param(copy_mdl.parameters, name, value)
+
+        try:
+            # clean_before_solve descarta la solución anterior para que no sirva de arranque
+            sol = copy_mdl.solve(log_output=False, clean_before_solve=True)
+            solution_dict, _ = cplex_results(copy_mdl, copy_x, problem, model_name, sol)
+        finally:
+            for name in config:
+                reset_cplex_param(copy_mdl.parameters, name)
+
+        solution_dict["config"] = _config_str(config)
+        solution_dict["tiempo_construccion_(s)"] = build_time
+        solution_dict["tiempo_copia_(s)"] = copy_time
+        print(f"[{solution_dict['config']}] F.O = {solution_dict['func_obj']}, "
+              f"Gap = {solution_dict['por_gap']}, Tiempo = {solution_dict['tiempo_(s)']:.2f}s")
+        return solution_dict
+
+    if workers <= 1:
+        return [solve((mdl, x, 0.0), config) for config in configs]
+
+    copies = []
+    try:
+        for _ in range(workers):
+            start = time.perf_counter()
+            clone = mdl.clone()
+            clone_x = {arc: clone.get_var_by_index(var.index) for arc, var in x.items()}
+            copies.append((clone, clone_x, time.perf_counter() - start))
+
+        return _run_queue(solve, copies, configs)
+    finally:
+        for clone, _, _ in copies:
+            clone.end()
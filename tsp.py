@@ -4,6 +4,7 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from pprint import pprint
+import copy
 
 class TSP:
     def __init__(self, tsplib_file, optimal_tour_file=None, name=None):
@@ -57,6 +58,33 @@ class TSP:
             neighbors.append((neighbor, weight))
         return neighbors
 
+    def restricted(self, arcs):
+        """
+        Retorna una copia del problema cuyo grafo solo contiene los arcos entregados
+        (se mantienen todos los nodos y sus índices).
+        """
+        sub = copy.copy(self)
+        sub.G = self.G.__class__()
+        sub.G.add_nodes_from(self.G.nodes(data=True))
+        sub.G.add_edges_from((i, j, self.G[i][j]) for i, j in arcs)
+        return sub
+
+    def nearest_neighbor_tour(self, start=0) -> list:
+        """
+        Construye un tour con la heurística del vecino más cercano, partiendo desde start.
+        """
+        tour = [start]
+        visited = {start}
+
+        for _ in range(self.n - 1):
+            node = tour[-1]
+            candidates = [(w, j) for j, w in self.get_neighbors(node) if j not in visited]
+            _, next_node = min(candidates)
+            visited.add(next_node)
+            tour.append(next_node)
+
+        return tour
+
     def validate_solution_matrix(self, matrix: np.ndarray) -> list | None:
         """
         Dada una matriz de solución binaria, se valida su calidad como solución, y se retorna
@@ -1,4 +1,7 @@
 from tsp import TSP
+from gurobipy import GRB
+from docplex.mp.relax_linear import LinearRelaxer
+import numpy as np
 
 
 def instance_loader(
@@ -30,3 +33,122 @@ def instance_loader(
         )
 
     return problem_dict
+
+
+def gurobi_results(mdl, x, problem: TSP, model_name: str) -> tuple[dict, np.ndarray]:
+    """
+    Extrae los resultados de un modelo de Gurobi ya resuelto.
+    Retorna una tupla con el diccionario de resultados (mismo formato que los *_solve)
+    y la matriz de decisión.
+    """
+    n = problem.n
+    gap_str = "N/A"
+    func = "N/A"
+    x_matrix = np.zeros((n, n))
+
+    if mdl.SolCount > 0:
+        func = mdl.ObjVal
+
+        if mdl.Status == GRB.OPTIMAL:
+            gap_str = "0.00%"
+        else:
+            gap_str = f"{mdl.MIPGap * 100:.6f}%"
+
+        for (i, j), var in x.items():
+            x_matrix[i, j] = round(var.X)
+
+    elif mdl.Status == GRB.INFEASIBLE:
+        func = "INFACTIBLE"
+
+    solution_dict = {
+        "instancia": problem.name,
+        "num_nodos": n,
+        "modelo": model_name,
+        "solver": "gurobi",
+        "num_vars": mdl.NumVars,
+        "num_rest": mdl.NumConstrs,
+        "tiempo_(s)": mdl.Runtime,
+        "por_gap": gap_str,
+        "func_obj": func,
+    }
+
+    return solution_dict, x_matrix
+
+
+def cplex_results(mdl, x, problem: TSP, model_name: str, sol) -> tuple[dict, np.ndarray]:
+    """
+    Extrae los resultados de un modelo de docplex ya resuelto, dada la solución
+    retornada por mdl.solve() (None si no se encontró solución).
+    """
+    n = problem.n
+    gap_str = "N/A"
+    func = "INFACTIBLE"
+    x_matrix = np.zeros((n, n))
+
+    if sol is not None:
+        func = sol.objective_value
+        # Igual que gg_cplex_solve/mtz_cplex_solve: siempre se reporta el gap de CPLEX
+        gap_str = f"{mdl.solve_details.mip_relative_gap * 100:.6f}%"
+
+        for (i, j), var in x.items():
+            x_matrix[i, j] = round(sol.get_value(var))
+
+    solution_dict = {
+        "instancia": problem.name,
+        "num_nodos": n,
+        "modelo": model_name,
+        "solver": "cplex",
+        "num_vars": mdl.number_of_variables,
+        "num_rest": mdl.number_of_constraints,
+        "tiempo_(s)": mdl.solve_details.time,
+        "por_gap": gap_str,
+        "func_obj": func,
+    }
+
+    return solution_dict, x_matrix
+
+
+def gurobi_lp_bound(mdl) -> float:
+    """
+    Retorna la cota de la relajación lineal de un modelo de Gurobi (sin modificarlo).
+    """
+    # Aplicar las restricciones pendientes antes de relajar
+    mdl.update()
+    relaxed = mdl.relax()
+    relaxed.setParam("OutputFlag", 0)
+    relaxed.optimize()
+    bound = relaxed.ObjVal if relaxed.Status == GRB.OPTIMAL else float("nan")
+    relaxed.dispose()
+    return bound
+
+
+def cplex_lp_bound(mdl) -> float:
+    """
+    Retorna la cota de la relajación lineal de un modelo de docplex (sin modificarlo).
+    """
+    relaxed = LinearRelaxer.make_relaxed_model(mdl)
+    sol = relaxed.solve(log_output=False)
+    bound = sol.objective_value if sol is not None else float("nan")
+    relaxed.end()
+    return bound
+
+
+def set_cplex_param(parameters, name: str, value):
+    """
+    Fija un parámetro de CPLEX a partir de su ruta con puntos, e.g. "mip.strategy.search",
+    sobre mdl.parameters o context.cplex_parameters.
+    """
+    param = parameters
+    for attr in name.split("."):
+        param = getattr(param, attr)
+    param.set(value)
+
+
+def reset_cplex_param(parameters, name: str):
+    """
+    Devuelve a su valor por defecto un parámetro de CPLEX dado por su ruta con puntos.
+    """
+    param = parameters
+    for attr in name.split("."):
+        param = getattr(param, attr)
+    param.reset()